@@ -1,7 +1,14 @@
+from .cryptic_utils import AnswerExplainer
 from .cryptic_utils import BitsAndPieces
 from .cryptic_utils import Clue
+from .cryptic_utils import DoubleDefinitionSolver
+from .cryptic_utils import LetterSelectionHelper
 from .utils import Utils
 from .word_utils import AnagramHelper
 from .word_utils import DefinitionHelper
+from .word_utils import LoadProfile
+from .word_utils import QueryCache
 from .word_utils import WordManager
 from .word_utils import Words
+from .word_utils import WordsStream
+from .warm_up import WarmUp
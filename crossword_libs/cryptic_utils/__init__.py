@@ -1,2 +1,5 @@
+from .answer_explainer import AnswerExplainer
 from .bits_and_pieces import BitsAndPieces
 from .clue import Clue
+from .double_definition_solver import DoubleDefinitionSolver
+from .letter_selection_helper import LetterSelectionHelper
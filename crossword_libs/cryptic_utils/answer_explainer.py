@@ -0,0 +1,126 @@
+import heapq
+from .bits_and_pieces import BitsAndPieces
+from ..word_utils import WordManager
+from ..word_utils import WordUtils
+
+
+class AnswerExplainer(object):
+    """
+    Explains a candidate answer by splitting it into bits-and-pieces and plain words,
+    which lets us check whether the answer is built from the wordplay in the clue.
+    For example:
+      "pious" -> "pi" (self righteous) + "ous"
+      "tarpon" -> "tar" (sailor) + "p" (piano) + "on" (about)
+    """
+
+    @staticmethod
+    def explain(answer, clue=None, min_word_length=3, max_results=None):
+        """
+        Returns a list of the ways the answer can be split into pieces. Each piece
+        is either an abbreviation from the bits-and-pieces, or a plain word from the
+        lexicon with at least min_word_length letters.
+
+        Each item in the list is a tuple of (score, [(letters, [phrases])]), where the
+        phrases are those the letters can stand for. Plain words, and words taken
+        directly from the clue, stand for themselves.
+
+        If a clue is provided, the score is the number of pieces with a phrase in
+        the clue. Phrases in the clue are listed first for each piece, and the results
+        are ordered with the highest score first, and then by the fewest pieces.
+        """
+        answer = WordUtils.clean_word(answer)
+
+        # We find the phrases from the clue, ie the phrases which the pieces might
+        # have come from...
+        clue_words = set()
+        clue_phrases = set()
+        if clue is not None:
+            clue_words.update(WordUtils.remove_punctuation(clue).split())
+            bits_and_pieces = BitsAndPieces().bits_and_pieces_from_clue(clue)
+            clue_phrases.update(phrase for (phrase, _) in bits_and_pieces)
+            clue_phrases.update(clue_words)
+
+        # We find the pieces starting at each position in the answer, and which
+        # positions the rest of the answer can be split from...
+        pieces_at = AnswerExplainer._find_pieces(answer, clue_words, clue_phrases, min_word_length)
+        can_complete = AnswerExplainer._find_completable_positions(answer, pieces_at)
+
+        # We enumerate the splits, and order them by score...
+        splits = AnswerExplainer._enumerate_splits(answer, pieces_at, can_complete)
+        results = (AnswerExplainer._score(split, clue_phrases) for split in splits)
+        sort_key = lambda result: (-result[0], len(result[1]))
+        if max_results is None:
+            return sorted(results, key=sort_key)
+        return heapq.nsmallest(max_results, results, key=sort_key)
+
+    @staticmethod
+    def _find_pieces(answer, clue_words, clue_phrases, min_word_length):
+        """
+        Returns a list holding, for each position in the answer, a list of
+        (end-position, letters, [phrases]) for the pieces starting at that position.
+
+        We only look at pieces up to the length of the longest abbreviation or word,
+        so this takes time proportional to the length of the answer times that length.
+        """
+        bits_and_pieces = BitsAndPieces()
+        word_manager = WordManager()
+        max_word_length = max(bits_and_pieces.max_abbreviation_length, word_manager.get_max_word_length())
+
+        pieces_at = []
+        for start in range(len(answer)):
+            pieces = []
+            for end in range(start+1, min(start+max_word_length, len(answer))+1):
+                letters = answer[start:end]
+                phrases = []
+                # The letters can stand for themselves if they are a word, or are
+                # taken straight from the clue...
+                if letters in clue_words or (len(letters) >= min_word_length and word_manager.is_word(letters)):
+                    phrases.append(letters)
+                phrases.extend(bits_and_pieces.phrases_for_abbreviation(letters))
+                if phrases:
+                    # We list the phrases from the clue first...
+                    phrases.sort(key=lambda phrase: phrase not in clue_phrases)
+                    pieces.append((end, letters, phrases))
+            pieces_at.append(pieces)
+        return pieces_at
+
+    @staticmethod
+    def _find_completable_positions(answer, pieces_at):
+        """
+        Returns a list of booleans holding, for each position in the answer (and the
+        end of the answer) whether the rest of the answer can be split into pieces.
+        """
+        can_complete = [False] * len(answer) + [True]
+        for start in reversed(range(len(answer))):
+            can_complete[start] = any(can_complete[end] for (end, _, _) in pieces_at[start])
+        return can_complete
+
+    @staticmethod
+    def _enumerate_splits(answer, pieces_at, can_complete):
+        """
+        Returns an iterable of the splits of the answer into pieces, each a list of
+        (letters, [phrases]). We only follow pieces from which the rest of the answer
+        can be completed, so we never explore a split which does not work.
+        """
+        if not can_complete[0]:
+            return
+
+        # Each item on the stack is (position, pieces-so-far)...
+        stack = [(0, [])]
+        while stack:
+            (start, split) = stack.pop()
+            if start == len(answer):
+                yield split
+                continue
+            for (end, letters, phrases) in pieces_at[start]:
+                if can_complete[end]:
+                    stack.append((end, split + [(letters, phrases)]))
+
+    @staticmethod
+    def _score(split, clue_phrases):
+        """
+        Returns (score, split), where the score is the number of pieces in the split
+        which have a phrase in the clue.
+        """
+        score = sum(1 for (_, phrases) in split if phrases[0] in clue_phrases)
+        return (score, split)
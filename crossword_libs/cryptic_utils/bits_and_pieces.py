@@ -1,5 +1,5 @@
 import logging
-from singleton_decorator import singleton
+from ..utils import singleton
 from collections import defaultdict
 from ..word_utils import WordUtils
 from ..utils import Utils
@@ -21,6 +21,12 @@ class BitsAndPieces(object):
         # A map of phrase -> [abbreviations]...
         self.abbreviations = self._load_from_file()
 
+        # The reverse map, of abbreviation -> [phrases]...
+        self.phrases = self._create_phrase_lookup()
+
+        # The length of the longest abbreviation...
+        self.max_abbreviation_length = max((len(x) for x in self.phrases), default=0)
+
     def bits_and_pieces_from_clue(self, clue, require_whole_word_if_length_less_than=4):
         """
         Returns a list of bits and pieces for the clue provided. Each item in 
@@ -48,6 +54,23 @@ class BitsAndPieces(object):
 
         return results
 
+    def phrases_for_abbreviation(self, abbreviation):
+        """
+        Returns the list of phrases which the abbreviation can stand for. For example:
+          "tar" -> ["sailor", ...]
+        """
+        return self.phrases.get(abbreviation, [])
+
+    def _create_phrase_lookup(self):
+        """
+        Returns a map of abbreviation -> [phrases], from the map of phrase -> [abbreviations].
+        """
+        results = defaultdict(list)
+        for (phrase, abbreviations) in self.abbreviations.items():
+            for abbreviation in abbreviations:
+                results[abbreviation].append(phrase)
+        return results
+
     def _load_from_file(self):
         """
         Returns a map of phrase -> letters loaded from the bits_and_pieces.txt file.
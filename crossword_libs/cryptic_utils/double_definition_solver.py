@@ -0,0 +1,159 @@
+from ..word_utils import DefinitionHelper
+from ..word_utils import WordManager
+from ..word_utils import WordUtils
+
+
+class DoubleDefinitionSolver(object):
+    """
+    Solves double-definition clues, where each half of the clue is a definition
+    of the answer. For example:
+      "Box pole" (4) -> "spar"
+
+    It also finds candidates for definition-plus-wordplay clues, when the wordplay
+    half happens to define the answer as well.
+
+    We try every point at which the clue can be split, and find the answers which
+    match the definitions on both sides. The candidates for each definition are held
+    as bitsets of word IDs - ie, as integers where bit n is set if the word with
+    ID n is a candidate - so each split is checked with a single AND.
+    """
+
+    # Words which can link the two definitions, eg "Stern and hard", which we
+    # skip when splitting the clue...
+    _LINK_WORDS = {"and", "or", "for", "is", "in", "as", "to", "of", "with", "gives", "makes", "being"}
+
+    @staticmethod
+    def solve(clue, enumeration, max_results=None):
+        """
+        Returns a list of (answer, score, left-definition, right-definition) for answers
+        matching definitions on both sides of a split of the clue. Answers are ordered
+        with the highest score first.
+
+        Each definition supports an answer more strongly if the answer is a synonym of
+        it rather than, say, a more specific word (see DefinitionHelper.supported_words_for_definition).
+        The score for a split is the support from its left definition plus the support
+        from its right definition. An answer's score is the total of the scores from
+        all the splits which produce it, and we return the split with the highest score.
+
+        The enumeration is the length of the answer, or a list of lengths for answers
+        of more than one word, eg [3, 4]. Definitions return phrases without their
+        spaces, so for answers of more than one word only the total length is checked.
+        """
+        lengths = list(enumeration) if isinstance(enumeration, (list, tuple)) else [enumeration]
+        target_length = sum(lengths)
+        words_in_clue = WordUtils.remove_punctuation(clue).split()
+
+        # The IDs of words of the target length. These are the words in the WordManager,
+        # followed by any other words (such as phrases) which the definitions return...
+        word_ids = _WordIds(WordManager().get_words(target_length))
+
+        # The candidates for each definition, as phrase -> (bitset, answer -> support).
+        # Each phrase can appear in more than one split, so we only find them once...
+        candidates = dict()
+        def get_candidates(phrase):
+            if phrase not in candidates:
+                candidates[phrase] = DoubleDefinitionSolver._candidates_for_definition(phrase, target_length, word_ids)
+            return candidates[phrase]
+
+        # We try each split, and find the answers from both definitions. The scores
+        # are held as answer -> total score, and the best split as answer -> (score, left, right)...
+        total_scores = dict()
+        best_splits = dict()
+        for (left, right) in DoubleDefinitionSolver._splits(words_in_clue):
+            # We find the candidates for one side first, and skip the other side if there
+            # are none. We start with a side we have already found, or else with the side
+            # with more words, as longer phrases usually have fewer candidates...
+            (first, second) = sorted((left, right), key=lambda phrase: (phrase not in candidates, -len(phrase.split())))
+            (first_bits, _) = get_candidates(first)
+            if first_bits == 0: continue
+            (second_bits, _) = get_candidates(second)
+            answer_bits = first_bits & second_bits
+            if answer_bits == 0: continue
+
+            (_, left_supports) = candidates[left]
+            (_, right_supports) = candidates[right]
+            for answer in word_ids.words_from_bits(answer_bits):
+                score = left_supports[answer] + right_supports[answer]
+                total_scores[answer] = total_scores.get(answer, 0.0) + score
+                if answer not in best_splits or score > best_splits[answer][0]:
+                    best_splits[answer] = (score, left, right)
+
+        results = [(answer, total_scores[answer], left, right) for (answer, (_, left, right)) in best_splits.items()]
+        results.sort(key=lambda result: (-result[1], result[0]))
+        return results if max_results is None else results[:max_results]
+
+    @staticmethod
+    def _splits(words_in_clue):
+        """
+        Returns an iterable of (left-phrase, right-phrase) for the ways the clue can be
+        split into two definitions, with or without a link word between them.
+        """
+        for split in range(1, len(words_in_clue)):
+            yield (" ".join(words_in_clue[:split]), " ".join(words_in_clue[split:]))
+
+            # If the word after the split is a link word, we also try the split without it...
+            if words_in_clue[split] in DoubleDefinitionSolver._LINK_WORDS and split+1 < len(words_in_clue):
+                yield (" ".join(words_in_clue[:split]), " ".join(words_in_clue[split+1:]))
+
+    @staticmethod
+    def _candidates_for_definition(phrase, target_length, word_ids):
+        """
+        Returns (bitset, answer -> support) for the words of the target length
+        matching the definition.
+        """
+        definition = phrase.replace(" ", "_")
+        supports = DefinitionHelper.supported_words_for_definition(definition, target_length)
+        bits = 0
+        for word in supports:
+            bits |= 1 << word_ids.get_id(word)
+        return (bits, supports)
+
+
+class _WordIds(object):
+    """
+    Assigns integer IDs to words, for use in bitsets.
+    """
+
+    def __init__(self, words_with_length):
+        """
+        Constructor. words_with_length is the WordManager's collection of words
+        of one length, as word -> index.
+        """
+        self._ids = words_with_length
+
+        # Words which are not in the WordManager, as word -> ID, and the list of
+        # these words in ID order...
+        self._extra_ids = dict()
+        self._extra_words = []
+
+        # The list of words in the WordManager in ID order, created when first needed...
+        self._words = None
+
+    def get_id(self, word):
+        """
+        Returns the ID for the word, assigning one if it is not in the WordManager.
+        """
+        word_id = self._ids.get(word, None)
+        if word_id is not None:
+            return word_id
+        word_id = self._extra_ids.get(word, None)
+        if word_id is None:
+            word_id = len(self._ids) + len(self._extra_words)
+            self._extra_ids[word] = word_id
+            self._extra_words.append(word)
+        return word_id
+
+    def words_from_bits(self, bits):
+        """
+        Returns an iterable of the words whose IDs are set in the bitset.
+        """
+        if self._words is None:
+            self._words = list(self._ids)
+        while bits:
+            lowest_bit = bits & -bits
+            word_id = lowest_bit.bit_length() - 1
+            if word_id < len(self._words):
+                yield self._words[word_id]
+            else:
+                yield self._extra_words[word_id - len(self._words)]
+            bits ^= lowest_bit
@@ -0,0 +1,103 @@
+from collections import defaultdict
+from ..word_utils import WordManager
+from ..word_utils import WordUtils
+
+
+class LetterSelectionHelper(object):
+    """
+    Finds answers made by selecting letters from the words in a clue. For example:
+      "initial letters" of "sailors are good workers"  -> "sagw"
+      "reversal" of "star"                             -> "rats"
+      "odd letters" of "pearl"                         -> "pal"
+      "beheaded" of "stable"                           -> "table"
+
+    We try each selection for every run of consecutive words in the clue, and
+    return the candidates which are words of the requested length.
+    """
+
+    # The selections, as (name, function returning the length of the selection, function
+    # returning the selection). The functions take the list of words in the span and the
+    # letters of the span joined together. The length is calculated without building the
+    # selection, so we only build the selections which have the right length...
+    _SELECTIONS = [
+        ("initial letters", lambda words, letters: len(words), lambda words, letters: "".join(word[0] for word in words)),
+        ("last letters", lambda words, letters: len(words), lambda words, letters: "".join(word[-1] for word in words)),
+        ("odd letters", lambda words, letters: (len(letters) + 1) // 2, lambda words, letters: letters[0::2]),
+        ("even letters", lambda words, letters: len(letters) // 2, lambda words, letters: letters[1::2]),
+        ("reversal", lambda words, letters: len(letters), lambda words, letters: letters[::-1]),
+        ("beheaded", lambda words, letters: len(letters) - 1, lambda words, letters: letters[1:]),
+        ("curtailed", lambda words, letters: len(letters) - 1, lambda words, letters: letters[:-1]),
+        ("heartless", lambda words, letters: len(letters) - 2 + len(letters) % 2, lambda words, letters: LetterSelectionHelper._remove_heart(letters)),
+    ]
+
+    @staticmethod
+    def letter_selections(clue, enumeration):
+        """
+        Returns a list of (answer, selection, span) for letter selections from the clue
+        which are words matching the enumeration. The span is the text from the clue
+        which the letters were selected from. For example:
+          letter_selections("Star turned rodents", 4) -> [("rats", "reversal", "star"), ...]
+
+        The enumeration is the length of the answer, or a list of lengths for answers
+        of more than one word, eg [3, 4].
+        """
+        lengths = list(enumeration) if isinstance(enumeration, (list, tuple)) else [enumeration]
+        target_length = sum(lengths)
+        words_in_clue = WordUtils.remove_punctuation(clue).split()
+
+        # We collect the candidates of the target length from every span of words,
+        # as candidate -> [(selection, span)]...
+        candidates = defaultdict(list)
+        for start in range(len(words_in_clue)):
+            for end in range(start+1, len(words_in_clue)+1):
+                words = words_in_clue[start:end]
+                letters = "".join(words)
+
+                # Every selection gets longer as the span gets longer, so once the
+                # shortest selection is too long, no longer span can match...
+                if min(len(words), len(letters) // 2) > target_length:
+                    break
+
+                for (selection, get_length, select) in LetterSelectionHelper._SELECTIONS:
+                    if get_length(words, letters) == target_length:
+                        candidates[select(words, letters)].append((selection, " ".join(words)))
+
+        # We check all the candidates against the words with each length, and return
+        # the answers in the order of the spans they came from...
+        answers = LetterSelectionHelper._find_answers(candidates.keys(), lengths)
+
+        results = []
+        for (candidate, sources) in candidates.items():
+            if candidate not in answers: continue
+            for (selection, span) in sources:
+                results.append((candidate, selection, span))
+        return results
+
+    @staticmethod
+    def _find_answers(candidates, lengths):
+        """
+        Returns the set of candidates which are words (or, for enumerations of more
+        than one word, are made up of words) with the lengths specified.
+        """
+        word_manager = WordManager()
+        if len(lengths) == 1:
+            return candidates & word_manager.get_words(lengths[0]).keys()
+
+        answers = set()
+        for candidate in candidates:
+            position = 0
+            for length in lengths:
+                if candidate[position:position+length] not in word_manager.get_words(length): break
+                position += length
+            else:
+                answers.add(candidate)
+        return answers
+
+    @staticmethod
+    def _remove_heart(letters):
+        """
+        Returns the letters with their middle letter (or middle two letters, if
+        there is an even number of letters) removed.
+        """
+        half = (len(letters) - 1) // 2
+        return letters[:half] + letters[len(letters)-half:]
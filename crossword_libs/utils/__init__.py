@@ -1 +1,2 @@
+from .singleton import singleton
 from .utils import Utils
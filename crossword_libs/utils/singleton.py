@@ -0,0 +1,62 @@
+import threading
+
+
+class _SingletonWrapper(object):
+    """
+    Wraps a class so that calling the wrapper returns a single, shared instance
+    of the class.
+
+    Creation of the instance is guarded by a lock, so if two threads request the
+    instance at the same time, one of them creates it while the other waits for it.
+    The wrapped class is available as __wrapped__, and its class attributes are
+    available from the wrapper.
+    """
+
+    def __init__(self, cls):
+        """
+        Constructor.
+        """
+        self.__wrapped__ = cls
+        self._instance = None
+        self._lock = threading.RLock()
+
+    def __call__(self, *args, **kwargs):
+        """
+        Returns the instance of the wrapped class, creating it if necessary.
+
+        Arguments are only used when creating the instance. If the instance already
+        exists and arguments are passed, they are given to the instance's
+        _check_arguments() method (if it has one), so it can warn that they are ignored.
+        """
+        # We only take the lock if the instance has not yet been created...
+        instance = self._instance
+        if instance is None:
+            with self._lock:
+                if self._instance is None:
+                    self._instance = self.__wrapped__(*args, **kwargs)
+                    return self._instance
+                instance = self._instance
+
+        if (args or kwargs) and hasattr(instance, "_check_arguments"):
+            instance._check_arguments(*args, **kwargs)
+        return instance
+
+    def __getattr__(self, name):
+        """
+        Makes class attributes of the wrapped class, such as constants and
+        static methods, available from the wrapper.
+        """
+        return getattr(self.__wrapped__, name)
+
+    def is_created(self):
+        """
+        Returns True if the instance has been created.
+        """
+        return self._instance is not None
+
+
+def singleton(cls):
+    """
+    A thread-safe singleton decorator for classes.
+    """
+    return _SingletonWrapper(cls)
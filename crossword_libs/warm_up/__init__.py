@@ -0,0 +1 @@
+from .warm_up import WarmUp
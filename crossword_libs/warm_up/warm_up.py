@@ -0,0 +1,182 @@
+import logging
+import threading
+import time
+from ..cryptic_utils import BitsAndPieces
+from ..utils import singleton
+from ..word_utils import AnagramHelper
+from ..word_utils import WordManager
+
+
+@singleton
+class WarmUp(object):
+    """
+    Loads the words, indexes and abbreviations in the background, so that an
+    application can start up immediately rather than waiting for them to load.
+
+    Loading is split into stages, each of which runs on its own thread once the
+    stages it depends on are ready. You can check which stages are ready, and
+    use the parts of the library which only need those stages while the others
+    are still loading. For example:
+      WarmUp().warm_up()
+      ...
+      if WarmUp().is_ready("bits_and_pieces"):
+          BitsAndPieces().bits_and_pieces_from_clue(clue)
+
+    Stages:
+    - words:           The WordManager (all words and their pos-tags)
+    - anagrams:        The AnagramHelper's anagram lookup
+    - trie:            The lexicon trie used by Words().match() and Words().near()
+    - bits_and_pieces: The BitsAndPieces abbreviations
+    """
+
+    # The states of a stage...
+    PENDING = "pending"
+    LOADING = "loading"
+    READY = "ready"
+    FAILED = "failed"
+
+    def __init__(self):
+        """
+        Constructor.
+        """
+        # The stages, as name -> (function to load the stage, [names of stages it depends on])...
+        self._stages = {
+            "words": (lambda: WordManager(self._profile), []),
+            "anagrams": (AnagramHelper, ["words"]),
+            "trie": (lambda: WordManager().get_trie(), ["words"]),
+            "bits_and_pieces": (BitsAndPieces, []),
+        }
+
+        # The state of each stage, the time each took to load, and the exception
+        # raised by any stage which failed...
+        self._states = {name: WarmUp.PENDING for name in self._stages}
+        self._load_times = dict()
+        self.errors = dict()
+
+        # Events which are set when each stage finishes loading (or fails)...
+        self._finished = {name: threading.Event() for name in self._stages}
+
+        # The LoadProfile (or name of one) to load words with...
+        self._profile = None
+
+        self._started = False
+        self._lock = threading.Lock()
+
+    def warm_up(self, profile=None):
+        """
+        Starts loading all stages on background threads, and returns immediately.
+        Calling this more than once has no further effect.
+
+        The profile is the LoadProfile (or the name of one) used to load words, if
+        the words have not already been loaded. We warn if warm-up has already started
+        with a different profile.
+        """
+        with self._lock:
+            if self._started:
+                if profile is not None and WordManager._get_profile(profile) is not WordManager._get_profile(self._profile):
+                    logging.warning("Warm-up has already started, so profile '{0}' is ignored. Use WordManager().load_profile() to change the profile.".format(
+                        WordManager._get_profile(profile).name))
+                return self
+            self._started = True
+            self._profile = profile
+
+        logging.info("Warming up in the background.")
+        for name in self._stages:
+            thread = threading.Thread(target=self._load_stage, args=(name,), name="warm-up-" + name, daemon=True)
+            thread.start()
+        return self
+
+    def is_ready(self, stage=None):
+        """
+        Returns True if the stage has loaded, or if all stages have loaded if no
+        stage is specified.
+        """
+        with self._lock:
+            if stage is None:
+                return all(state == WarmUp.READY for state in self._states.values())
+            return self._states[stage] == WarmUp.READY
+
+    def wait(self, stage=None, timeout=None):
+        """
+        Waits until the stage (or all stages if no stage is specified) has finished
+        loading, or until the timeout in seconds. Returns True if the stages are ready.
+        """
+        stages = self._stages if stage is None else [stage]
+        deadline = None if timeout is None else time.perf_counter() + timeout
+        for name in stages:
+            remaining = None if deadline is None else max(0, deadline - time.perf_counter())
+            if not self._finished[name].wait(remaining):
+                return False
+        return self.is_ready(stage)
+
+    def status(self):
+        """
+        Returns a dictionary of stage-name -> state, where the state is one of
+        PENDING, LOADING, READY or FAILED.
+        """
+        with self._lock:
+            return dict(self._states)
+
+    def progress(self):
+        """
+        Returns the fraction (from 0.0 to 1.0) of the stages which are ready.
+        """
+        with self._lock:
+            num_ready = sum(1 for state in self._states.values() if state == WarmUp.READY)
+            return num_ready / len(self._states)
+
+    def load_times(self):
+        """
+        Returns a dictionary of stage-name -> seconds taken to load, for stages
+        which have loaded.
+        """
+        with self._lock:
+            return dict(self._load_times)
+
+    def _load_stage(self, name):
+        """
+        Loads the stage, once the stages it depends on are ready.
+        Runs on the stage's background thread.
+        """
+        (load, dependencies) = self._stages[name]
+
+        # We wait for the stages this one depends on. If any of them failed this
+        # stage fails as well...
+        for dependency in dependencies:
+            self._finished[dependency].wait()
+            if dependency in self.errors:
+                self._finish(name, WarmUp.FAILED, error=self.errors[dependency])
+                return
+
+        self._set_state(name, WarmUp.LOADING)
+        start_time = time.perf_counter()
+        try:
+            load()
+        except Exception as ex:
+            logging.exception("Warm-up stage '{0}' failed.".format(name))
+            self._finish(name, WarmUp.FAILED, error=ex)
+            return
+
+        load_time = time.perf_counter() - start_time
+        logging.info("Warm-up stage '{0}' ready in {1:.1f}s.".format(name, load_time))
+        self._finish(name, WarmUp.READY, load_time=load_time)
+
+    def _set_state(self, name, state):
+        """
+        Sets the state of the stage.
+        """
+        with self._lock:
+            self._states[name] = state
+
+    def _finish(self, name, state, load_time=None, error=None):
+        """
+        Records that the stage has finished loading, or has failed, and wakes up
+        anything waiting for it.
+        """
+        with self._lock:
+            self._states[name] = state
+            if load_time is not None:
+                self._load_times[name] = load_time
+            if error is not None:
+                self.errors[name] = error
+        self._finished[name].set()
@@ -1,8 +1,13 @@
 from .anagram_helper import AnagramHelper
 from .definition_helper import DefinitionHelper
 from .lemma_info import LemmaInfo
+from .lexicon_trie import LexiconTrie
+from .load_profile import LoadProfile
+from .query_cache import QueryCache
+from .regex_automaton import RegexAutomaton
 from .word_info import WordInfo
 from .word_manager import WordManager
 from .word_utils import WordUtils
 from .words import Words
+from .words_stream import WordsStream
 
@@ -1,5 +1,6 @@
 import itertools
-from singleton_decorator import singleton
+import threading
+from ..utils import singleton
 from collections import defaultdict
 from .word_manager import WordManager
 from .word_utils import WordUtils
@@ -15,6 +16,11 @@ class AnagramHelper(object):
         """
         Constructor.
         """
+        # The version of the WordManager's words which the lookup was created from.
+        # If the words are reloaded, we recreate the lookup...
+        self._lexicon_version = WordManager().lexicon_version
+        self._lock = threading.Lock()
+
         # We create a mapping of anagram-key -> [words-which-are-anagrams-of-each-other]...
         self._character_prime_map = self._create_character_prime_map()
         self._anagram_lookup = self._create_anagram_lookup()
@@ -28,6 +34,8 @@ class AnagramHelper(object):
           anagrams("astronomer", [4, 6]) -> ["moon", "starer"]
         """
 
+        anagram_lookup = self._get_anagram_lookup()
+
         # If no word-length was specified, we specify that we want anagrams for the full
         # length of the word...
         if word_lengths is None:
@@ -46,7 +54,7 @@ class AnagramHelper(object):
             anagrams_for_words = []  # List of anagrams for each word in the split
             for word in split:
                 anagram_key = self._get_anagram_key(word)
-                anagrams_for_word = self._anagram_lookup.get(anagram_key, None)
+                anagrams_for_word = anagram_lookup.get(anagram_key, None)
                 if anagrams_for_word is None:
                     # There are no anagrams for this word...
                     all_words_have_anagrams = False
@@ -62,6 +70,17 @@ class AnagramHelper(object):
                 for product in products:
                     yield product
 
+    def _get_anagram_lookup(self):
+        """
+        Returns the anagram lookup, recreating it if the words have been reloaded.
+        """
+        with self._lock:
+            lexicon_version = WordManager().lexicon_version
+            if lexicon_version != self._lexicon_version:
+                self._anagram_lookup = self._create_anagram_lookup()
+                self._lexicon_version = lexicon_version
+            return self._anagram_lookup
+
     def _create_character_prime_map(self):
         """
         Returns a dictionary of character -> prime-number for use with
@@ -9,6 +9,12 @@ class DefinitionHelper(object):
       "rodents" -> "rats", "mice"
     """
 
+    # The support for words found from the definition's synsets, from synsets similar
+    # to them, and from their hyponyms...
+    _SYNONYM_SUPPORT = 1.0
+    _SIMILAR_SUPPORT = 0.75
+    _HYPONYM_SUPPORT = 0.5
+
     @staticmethod
     def words_for_definition(definition):
         """
@@ -27,43 +33,93 @@ class DefinitionHelper(object):
         # and then find the corresponding form for each lemma.
         word_manager = WordManager()
         definition_pos_tags = word_manager.get_pos_tags(definition)
+
+        # If we do not have pos-tags for the definition (for example, if it is a
+        # phrase such as "sea_horse") we return the lemmas as they are...
+        if not definition_pos_tags:
+            yield from lemmas
+            return
+
         for definition_pos_tag in definition_pos_tags:
             for lemma in lemmas:
                 # We find the part-of-speech for this lemma for the current pos-tag...
                 part_of_speech = word_manager.get_part_of_speech(lemma, definition_pos_tag)
                 yield part_of_speech
 
+    @staticmethod
+    def supported_words_for_definition(definition, length=None):
+        """
+        Returns a dictionary of word -> support for the words matching the definition,
+        optionally only those with the length specified. For example:
+          "rodents" -> {"rats": 1.0, "mice": 1.0, "voles": 0.5, ...}
+
+        The support shows how closely the word matches the definition: 1.0 for direct
+        synonyms, 0.75 for similar words and 0.5 for hyponyms (more specific words,
+        eg "oak" for "tree").
+        """
+        word_manager = WordManager()
+        lemma_infos = word_manager.lemma_infos
+        definition_pos_tags = word_manager.get_pos_tags(definition)
+
+        results = dict()
+        for (lemma, support) in DefinitionHelper._supported_lemmas_for_definition(definition).items():
+            # We skip lemmas which have no form with the length we want, before we
+            # look for the form matching the definition's part-of-speech...
+            if length is not None and len(lemma) != length:
+                lemma_info = lemma_infos.get(lemma, None)
+                if lemma_info is None or all(len(word) != length for word in lemma_info.word_forms.values()):
+                    continue
+
+            # We convert the lemma to the part-of-speech corresponding to the definition,
+            # as in words_for_definition()...
+            if definition_pos_tags:
+                words = {word_manager.get_part_of_speech(lemma, pos_tag) for pos_tag in definition_pos_tags}
+            else:
+                words = {lemma}
+
+            for word in words:
+                if length is not None and len(word) != length: continue
+                if support > results.get(word, 0.0):
+                    results[word] = support
+        return results
+
     @staticmethod
     def _lemmas_for_definition(definition):
         """
         Returns an iterable of lemmas for the definition provided.
         """
-        synsets = set()
+        return iter(DefinitionHelper._supported_lemmas_for_definition(definition))
 
-        # We look up synsets for the word. These are words / concepts with the same meaning...
+    @staticmethod
+    def _supported_lemmas_for_definition(definition):
+        """
+        Returns a dictionary of lemma -> support for the definition provided.
+        """
+        # We look up synsets for the word. These are words / concepts with the same meaning.
+        # For each synset, we look up similar words...
+        supports = dict()
         for synset in wordnet.synsets(definition):
-            # For each synset, we look up similar words...
-            synsets = synsets.union(DefinitionHelper._find_similar_synsets(synset, 3))
+            for similar_synset in DefinitionHelper._find_similar_synsets(synset, 3):
+                support = DefinitionHelper._SYNONYM_SUPPORT if similar_synset == synset else DefinitionHelper._SIMILAR_SUPPORT
+                supports[similar_synset] = max(support, supports.get(similar_synset, 0.0))
 
         # We find hyponyms for each synset we've found...
         hyponyms = set()
-        for synset in synsets:
+        for synset in supports:
             hyponyms = hyponyms.union(DefinitionHelper._get_hyponyms_from_synset(synset))
-        synsets = synsets.union(hyponyms)
-
-        # We find all the words from the synsets we've found...
-        words = set()
-        for synset in synsets:
-            words_in_synset = DefinitionHelper._words_from_synset(synset)
-            for word_in_synset in words_in_synset:
-
+        for hyponym in hyponyms:
+            supports.setdefault(hyponym, DefinitionHelper._HYPONYM_SUPPORT)
+
+        # We find all the words from the synsets we've found, with the highest support
+        # from any synset they are in...
+        lemmas = dict()
+        for (synset, support) in supports.items():
+            for word_in_synset in DefinitionHelper._words_from_synset(synset):
                 # We clean the word, for example, to remove underscores...
                 clean_word = WordUtils.clean_word(word_in_synset)
-
-                # We return the word (if we have not already returned it previously)...
-                if clean_word in words: continue
-                words.add(clean_word)
-                yield clean_word
+                if support > lemmas.get(clean_word, 0.0):
+                    lemmas[clean_word] = support
+        return lemmas
 
     @staticmethod
     def _find_similar_synsets(synset, similar_to_recursion_level=0):
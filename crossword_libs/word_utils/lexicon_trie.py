@@ -0,0 +1,123 @@
+from bisect import bisect_left
+
+
+class LexiconTrie(object):
+    """
+    A prefix trie over a collection of words, used to search the words without
+    looking at each of them in turn.
+
+    Rather than holding a tree of nodes (which would need a lot of memory for the
+    full lexicon) we hold the words in a sorted list. The words under any node
+    of the trie - ie, the words starting with a given prefix - are a contiguous
+    range of the list, and we find the ranges for child nodes by binary search.
+    """
+
+    def __init__(self, words):
+        """
+        Constructor.
+        """
+        self._words = sorted(words)
+
+    def __len__(self):
+        """
+        Returns the number of words in the trie.
+        """
+        return len(self._words)
+
+    def match(self, automaton):
+        """
+        Returns an iterable of the words accepted by the RegexAutomaton provided,
+        in alphabetical order.
+
+        We walk the automaton together with the trie, and do not visit nodes for
+        which the automaton has no match.
+        """
+        # Each item on the stack is (prefix, automaton-state, start, end), where
+        # start and end are the range of words which begin with the prefix...
+        stack = [("", automaton.start, 0, len(self._words))]
+        while stack:
+            (prefix, state, start, end) = stack.pop()
+
+            # If the prefix is a word, it is the first in the range...
+            if start < end and self._words[start] == prefix:
+                if automaton.is_accepting(state):
+                    yield prefix
+                start += 1
+
+            # We add the child nodes which the automaton can continue to. They are
+            # added in reverse so that we visit them in alphabetical order...
+            children = []
+            for (child_prefix, child_start, child_end) in self._children(prefix, start, end):
+                child_state = automaton.step(state, child_prefix[-1])
+                if child_state:
+                    children.append((child_prefix, child_state, child_start, child_end))
+            stack.extend(reversed(children))
+
+    def near(self, word, max_distance, min_length=None, max_length=None):
+        """
+        Returns a list of (word, distance) for words within the edit distance
+        specified of the word provided, ordered by distance and then alphabetically.
+        A "." in the word provided matches any letter. If min_length or max_length
+        are specified, only words with lengths in that range are returned.
+
+        We walk the trie calculating the Levenshtein distance table for each prefix
+        from its parent's row, and do not visit the children of prefixes which are
+        already further than max_distance from every prefix of the word, or which
+        are already max_length long.
+        """
+        results = []
+
+        # Each item on the stack is (prefix, row, start, end). The row holds the
+        # distance from the prefix to each prefix of the word...
+        first_row = list(range(len(word) + 1))
+        stack = [("", first_row, 0, len(self._words))]
+        while stack:
+            (prefix, row, start, end) = stack.pop()
+
+            # If the prefix is a word, it is the first in the range...
+            if start < end and self._words[start] == prefix:
+                if row[-1] <= max_distance and (min_length is None or len(prefix) >= min_length):
+                    results.append((prefix, row[-1]))
+                start += 1
+
+            # We add child nodes which could still be close enough to the word...
+            if max_length is not None and len(prefix) >= max_length:
+                continue
+            for (child_prefix, child_start, child_end) in self._children(prefix, start, end):
+                child_row = LexiconTrie._next_distance_row(row, word, child_prefix[-1])
+                if min(child_row) <= max_distance:
+                    stack.append((child_prefix, child_row, child_start, child_end))
+
+        results.sort(key=lambda result: (result[1], result[0]))
+        return results
+
+    @staticmethod
+    def _next_distance_row(row, word, letter):
+        """
+        Returns the row of the Levenshtein distance table following the row provided,
+        when the letter is added to the prefix.
+        """
+        next_row = [row[0] + 1]
+        for (index, word_letter) in enumerate(word):
+            substitution_cost = 0 if word_letter in (letter, ".") else 1
+            next_row.append(min(
+                row[index+1] + 1,                   # Deletion
+                next_row[index] + 1,                # Insertion
+                row[index] + substitution_cost))    # Substitution
+        return next_row
+
+    def _children(self, prefix, start, end):
+        """
+        Returns an iterable of (child-prefix, start, end) for the child nodes of the
+        node for the prefix, where the words for the node are in the range start to end.
+        The range must not include the prefix itself.
+        """
+        depth = len(prefix)
+        while start < end:
+            # The next child is the next letter of the first word in the range. Its
+            # words end before the first word starting with the following letter...
+            child_prefix = self._words[start][:depth+1]
+            following_prefix = prefix + chr(ord(child_prefix[-1]) + 1)
+            child_end = bisect_left(self._words, following_prefix, start, end)
+            yield (child_prefix, start, child_end)
+            start = child_end
@@ -0,0 +1,92 @@
+class LoadProfile(object):
+    """
+    Controls which words the WordManager loads, so that the library can run with
+    less memory. For example, a profile can restrict the lengths of words, drop
+    words which are rare in the tagged corpora, or skip the words_alpha.txt file.
+
+    A profile can also set a memory budget (in bytes). If the words which pass
+    the other filters would use more than this, the loader keeps whole groups of
+    words while they fit: the words from the corpora, most common first, and then the
+    words only in words_alpha.txt, shortest first.
+
+    Named profiles are available from LoadProfile.named(), for example:
+      WordManager(LoadProfile.named("compact"))
+    """
+
+    def __init__(self, name, min_length=1, max_length=None, min_frequency=0,
+                 include_words_file=True, drop_junk_short_words=False, memory_budget=None):
+        """
+        Constructor.
+        """
+        # The name of the profile, used when reporting on loading...
+        self.name = name
+
+        # The range of word lengths to load. max_length is None if there is no maximum...
+        self.min_length = min_length
+        self.max_length = max_length
+
+        # Words are dropped if they appear fewer times than this in the tagged corpora.
+        # Words only in words_alpha.txt have a frequency of zero...
+        self.min_frequency = min_frequency
+
+        # Whether we load words from words_alpha.txt, as well as from the corpora...
+        self.include_words_file = include_words_file
+
+        # Whether we drop one and two letter "words" which are not real words,
+        # for example "ek" or "qp"...
+        self.drop_junk_short_words = drop_junk_short_words
+
+        # The maximum estimated memory for the words, in bytes, or None for no limit...
+        self.memory_budget = memory_budget
+
+    @staticmethod
+    def named(name):
+        """
+        Returns the profile with the name specified. The named profiles are:
+        - full:     All words from all sources
+        - standard: All words, except junk one and two letter words
+        - compact:  Words from the corpora of up to 15 letters (ie, which fit in a
+                    standard grid), plus the shortest words from words_alpha.txt which
+                    fit into a 64MB budget - usually those of six letters or fewer
+        - minimal:  Words seen at least twice in the corpora, of up to 15 letters.
+                    If these do not fit into a 16MB budget, the rarest are dropped
+        """
+        if name not in _NAMED_PROFILES:
+            raise ValueError("Unknown load profile '{0}'. Profiles are: {1}".format(name, ", ".join(_NAMED_PROFILES)))
+        return _NAMED_PROFILES[name]
+
+    def keeps(self, word, frequency):
+        """
+        Returns True if the word passes the profile's filters (not including
+        the memory budget).
+        """
+        length = len(word)
+        if length < self.min_length:
+            return False
+        if self.max_length is not None and length > self.max_length:
+            return False
+        if frequency < self.min_frequency:
+            return False
+        if self.drop_junk_short_words and length <= 2 and word not in VALID_SHORT_WORDS:
+            return False
+        return True
+
+
+# One and two letter words which are real words. Other words this short are
+# usually abbreviations or junk from the sources we load...
+VALID_SHORT_WORDS = frozenset([
+    "a", "i", "o",
+    "ab", "ad", "ah", "am", "an", "as", "at", "aw", "ax", "ay", "be", "by", "do", "eh", "em",
+    "en", "er", "ex", "go", "ha", "he", "hi", "hm", "ho", "id", "if", "in", "is", "it", "lo",
+    "ma", "me", "mi", "mu", "my", "no", "nu", "of", "oh", "oi", "ok", "on", "op", "or", "ow",
+    "ox", "oy", "pa", "pi", "re", "so", "ta", "ti", "to", "uh", "um", "up", "us", "we", "xi",
+    "ya", "ye", "yo"])
+
+
+_NAMED_PROFILES = {
+    "full": LoadProfile("full"),
+    "standard": LoadProfile("standard", drop_junk_short_words=True),
+    "compact": LoadProfile("compact", max_length=15, drop_junk_short_words=True, memory_budget=64*1024*1024),
+    "minimal": LoadProfile("minimal", max_length=15, min_frequency=2, include_words_file=False,
+                           drop_junk_short_words=True, memory_budget=16*1024*1024),
+}
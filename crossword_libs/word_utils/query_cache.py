@@ -0,0 +1,147 @@
+import sys
+import threading
+from collections import OrderedDict
+from ..utils import singleton
+
+
+@singleton
+class QueryCache(object):
+    """
+    Caches the results of Words queries, keyed by a normalized form of the query.
+
+    The cache is bounded both by the number of entries it holds and by an
+    estimate of the memory used by the cached words. When either bound is
+    exceeded, the least-recently-used entries are evicted.
+
+    The cache is shared by everything which uses the Words API, so repeated
+    queries - whether from interactive use or from a batch script - are only
+    calculated once.
+    """
+
+    def __init__(self, max_entries=256, max_bytes=64*1024*1024):
+        """
+        Constructor.
+        """
+        # The cached results, as query-key -> (words, size-in-bytes), in LRU order.
+        # The most recently used entry is at the end...
+        self._entries = OrderedDict()
+
+        # The limits on the size of the cache...
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+
+        # The estimated size of all the words we are holding...
+        self._total_bytes = 0
+
+        # Incremented each time the cache is invalidated. Results which were being
+        # calculated before an invalidation are not stored...
+        self._generation = 0
+
+        # Statistics...
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+
+        self._lock = threading.Lock()
+
+    def configure(self, max_entries=None, max_bytes=None):
+        """
+        Changes the limits on the size of the cache, evicting entries if the
+        cache is now too large.
+        """
+        with self._lock:
+            if max_entries is not None:
+                self.max_entries = max_entries
+            if max_bytes is not None:
+                self.max_bytes = max_bytes
+            self._evict()
+
+    def iterate(self, key, create_words):
+        """
+        Returns an iterator for the results of the query with the key specified.
+
+        If the results are in the cache, we iterate them from there. If not we
+        call create_words to start a new iteration of the query, and record the
+        words as they are returned. If the words are fully iterated, they are added
+        to the cache.
+
+        create_words must start the query from the beginning each time it is called.
+        Otherwise a partly iterated query would be cached as if it were complete.
+        """
+        with self._lock:
+            entry = self._entries.get(key, None)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                self._hits += 1
+                return iter(entry[0])
+            self._misses += 1
+            generation = self._generation
+
+        return self._record(key, create_words(), generation)
+
+    def invalidate(self):
+        """
+        Removes all entries from the cache, for example when the lexicon changes.
+        """
+        with self._lock:
+            self._entries.clear()
+            self._total_bytes = 0
+            self._generation += 1
+
+    def stats(self):
+        """
+        Returns a dictionary of statistics about the cache.
+        """
+        with self._lock:
+            return dict(
+                hits=self._hits,
+                misses=self._misses,
+                evictions=self._evictions,
+                entries=len(self._entries),
+                bytes=self._total_bytes)
+
+    def _record(self, key, words, generation):
+        """
+        Yields the words passed in, adding them to the cache if we iterate all of them.
+        """
+        results = []
+        size = sys.getsizeof(key)
+        for word in words:
+            # We record the word, unless the results have become too large to cache...
+            if results is not None:
+                results.append(word)
+                size += sys.getsizeof(word) + 8  # 8 bytes for the reference to the word
+                if size > self.max_bytes:
+                    results = None
+            yield word
+
+        if results is not None:
+            self._put(key, tuple(results), size, generation)
+
+    def _put(self, key, results, size, generation):
+        """
+        Adds results to the cache, evicting old entries if we need to.
+        """
+        with self._lock:
+            # If the cache was invalidated while we were calculating the results
+            # they may be out of date, so we do not store them...
+            if generation != self._generation:
+                return
+
+            # The same query may have been calculated twice at the same time...
+            if key in self._entries:
+                self._total_bytes -= self._entries.pop(key)[1]
+
+            self._entries[key] = (results, size)
+            self._total_bytes += size
+            self._evict()
+
+    def _evict(self):
+        """
+        Evicts the least-recently-used entries until the cache is within its limits.
+        Must be called with the lock held.
+        """
+        while self._entries and (len(self._entries) > self.max_entries or self._total_bytes > self.max_bytes):
+            (_, (_, size)) = self._entries.popitem(last=False)
+            self._total_bytes -= size
+            self._evictions += 1
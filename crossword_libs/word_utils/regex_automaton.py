@@ -0,0 +1,401 @@
+import re
+import string
+
+
+class _UnsupportedPattern(Exception):
+    """
+    Raised when parsing a pattern which uses regex features we do not support.
+    """
+    pass
+
+
+class RegexAutomaton(object):
+    """
+    An automaton for a regex pattern, which can be walked one character at a time.
+
+    This lets us match the pattern against the LexiconTrie, pruning whole branches
+    of the trie as soon as no word in them can match. For example, with the pattern
+    "b[aeiou]t+le" we never look at words starting with "c", or with "bb".
+
+    The pattern is compiled to a non-deterministic automaton (NFA). States of
+    the automaton we walk are sets of NFA states, and transitions between them are
+    calculated (and cached) as they are needed.
+
+    We support the regex features useful for finding words: literals, ".",
+    character classes, groups, alternation and the quantifiers *, +, ? and {m,n}.
+    Use RegexAutomaton.compile(), which returns None for patterns using any other
+    features.
+    """
+
+    # Character sets for escapes, as (characters, negated)...
+    _ESCAPES = {
+        "d": (frozenset(string.digits), False),
+        "D": (frozenset(string.digits), True),
+        "s": (frozenset(string.whitespace), False),
+        "S": (frozenset(string.whitespace), True),
+        "w": (frozenset(string.ascii_letters + string.digits + "_"), False),
+        "W": (frozenset(string.ascii_letters + string.digits + "_"), True),
+    }
+
+    # "." matches any character except a newline...
+    _ANY = (frozenset("\n"), True)
+
+    def __init__(self, tree):
+        """
+        Constructor. Builds the automaton from the parsed pattern.
+        """
+        # For each NFA state, a list of (character-set, target-state) transitions...
+        self._transitions = []
+
+        # For each NFA state, a list of states we can move to without a character...
+        self._epsilons = []
+
+        (start, self._accept) = self._build(tree)
+        self.start = self._closure({start})
+
+        # The lengths of the words the pattern can match. max_length is None if
+        # there is no maximum...
+        (self.min_length, self.max_length) = RegexAutomaton._length_range(tree)
+
+        # Cache of (state, character) -> next state...
+        self._steps = dict()
+
+    @staticmethod
+    def compile(pattern):
+        """
+        Returns a RegexAutomaton for the pattern, or None if the pattern uses
+        features we do not support.
+
+        Raises re.error if the pattern is not a valid regex.
+        """
+        re.compile(pattern)
+        try:
+            return RegexAutomaton(_Parser(pattern).parse())
+        except _UnsupportedPattern:
+            return None
+
+    def step(self, state, character):
+        """
+        Returns the state we move to from state on reading the character.
+        This is an empty set if no match is possible.
+        """
+        key = (state, character)
+        next_state = self._steps.get(key, None)
+        if next_state is None:
+            targets = set()
+            for nfa_state in state:
+                for ((characters, negated), target) in self._transitions[nfa_state]:
+                    if (character in characters) != negated:
+                        targets.add(target)
+            next_state = self._closure(targets)
+            self._steps[key] = next_state
+        return next_state
+
+    def is_accepting(self, state):
+        """
+        Returns True if the text read to reach the state matches the pattern.
+        """
+        return self._accept in state
+
+    def has_open_start(self, alphabet=string.ascii_lowercase):
+        """
+        Returns True if the pattern can start with any letter in the alphabet, for
+        example ".......", "....e..s" or ".*ing". Walking the trie cannot skip any
+        branches at the first letter for these patterns, and visits most of the
+        nodes near the root, so it is quicker to test each word with a regex.
+        """
+        return all(self.step(self.start, letter) for letter in alphabet)
+
+    def _closure(self, states):
+        """
+        Returns the set of states reachable from the states provided without
+        reading a character.
+        """
+        result = set(states)
+        to_visit = list(states)
+        while to_visit:
+            state = to_visit.pop()
+            for target in self._epsilons[state]:
+                if target not in result:
+                    result.add(target)
+                    to_visit.append(target)
+        return frozenset(result)
+
+    @staticmethod
+    def _length_range(tree):
+        """
+        Returns (min, max) for the length of text matched by the parsed pattern
+        (or part of a pattern). max is None if there is no maximum.
+        """
+        node_type = tree[0]
+        if node_type == "set":
+            return (1, 1)
+
+        if node_type == "concat":
+            ranges = [RegexAutomaton._length_range(item) for item in tree[1]]
+            max_lengths = [max_length for (_, max_length) in ranges]
+            return (sum(min_length for (min_length, _) in ranges), None if None in max_lengths else sum(max_lengths))
+
+        if node_type == "alternate":
+            ranges = [RegexAutomaton._length_range(item) for item in tree[1]]
+            max_lengths = [max_length for (_, max_length) in ranges]
+            return (min(min_length for (min_length, _) in ranges), None if None in max_lengths else max(max_lengths))
+
+        # A repeat...
+        (_, item, min_count, max_count) = tree
+        (item_min, item_max) = RegexAutomaton._length_range(item)
+        if item_max == 0:
+            return (0, 0)
+        if item_max is None or max_count is None:
+            return (item_min * min_count, None)
+        return (item_min * min_count, item_max * max_count)
+
+    def _new_state(self):
+        """
+        Adds a state to the NFA and returns it.
+        """
+        self._transitions.append([])
+        self._epsilons.append([])
+        return len(self._transitions) - 1
+
+    def _build(self, tree):
+        """
+        Adds NFA states for the parsed pattern (or part of a pattern) and returns
+        (start-state, end-state) for them.
+        """
+        start = self._new_state()
+        end = self._new_state()
+        node_type = tree[0]
+
+        if node_type == "set":
+            # A single character from a set...
+            self._transitions[start].append((tree[1], end))
+
+        elif node_type == "concat":
+            # A sequence of items, each following the previous one...
+            previous = start
+            for item in tree[1]:
+                (item_start, item_end) = self._build(item)
+                self._epsilons[previous].append(item_start)
+                previous = item_end
+            self._epsilons[previous].append(end)
+
+        elif node_type == "alternate":
+            # Any one of a collection of items...
+            for item in tree[1]:
+                (item_start, item_end) = self._build(item)
+                self._epsilons[start].append(item_start)
+                self._epsilons[item_end].append(end)
+
+        elif node_type == "repeat":
+            # An item repeated between min and max times (max is None if unbounded).
+            # We build the required copies of the item, followed by the optional ones...
+            (_, item, min_count, max_count) = tree
+            previous = start
+            for _ in range(min_count):
+                (item_start, item_end) = self._build(item)
+                self._epsilons[previous].append(item_start)
+                previous = item_end
+            if max_count is None:
+                (item_start, item_end) = self._build(item)
+                self._epsilons[previous].append(item_start)
+                self._epsilons[item_end].append(previous)
+            else:
+                for _ in range(max_count - min_count):
+                    (item_start, item_end) = self._build(item)
+                    self._epsilons[previous].append(item_start)
+                    self._epsilons[previous].append(end)
+                    previous = item_end
+            self._epsilons[previous].append(end)
+
+        return (start, end)
+
+
+class _Parser(object):
+    """
+    Parses the subset of regex syntax supported by RegexAutomaton into a tree of
+    tuples, one of:
+      ("set", (characters, negated))
+      ("concat", [items])
+      ("alternate", [items])
+      ("repeat", item, min, max)
+    """
+
+    # Limit on the number of copies of an item from {m,n} quantifiers...
+    _MAX_REPEAT = 100
+
+    def __init__(self, pattern):
+        """
+        Constructor.
+        """
+        self._pattern = pattern
+        self._position = 0
+
+    def parse(self):
+        """
+        Returns the tree for the whole pattern.
+        """
+        tree = self._parse_alternate()
+        if self._position != len(self._pattern):
+            raise _UnsupportedPattern()
+        return tree
+
+    def _peek(self):
+        """
+        Returns the next character, or None at the end of the pattern.
+        """
+        if self._position < len(self._pattern):
+            return self._pattern[self._position]
+        return None
+
+    def _next(self):
+        """
+        Returns the next character, and moves past it.
+        """
+        character = self._peek()
+        if character is None:
+            raise _UnsupportedPattern()
+        self._position += 1
+        return character
+
+    def _parse_alternate(self):
+        """
+        Parses items separated by "|".
+        """
+        items = [self._parse_concat()]
+        while self._peek() == "|":
+            self._position += 1
+            items.append(self._parse_concat())
+        return items[0] if len(items) == 1 else ("alternate", items)
+
+    def _parse_concat(self):
+        """
+        Parses a sequence of (possibly quantified) items.
+        """
+        items = []
+        while self._peek() not in (None, "|", ")"):
+            items.append(self._parse_repeat())
+        return ("concat", items)
+
+    def _parse_repeat(self):
+        """
+        Parses an item, followed by an optional quantifier.
+        """
+        item = self._parse_atom()
+        character = self._peek()
+        if character == "*":
+            (min_count, max_count) = (0, None)
+        elif character == "+":
+            (min_count, max_count) = (1, None)
+        elif character == "?":
+            (min_count, max_count) = (0, 1)
+        elif character == "{":
+            quantifier = self._parse_braces()
+            if quantifier is None:
+                return item  # The brace is a literal, which the next item will parse
+            (min_count, max_count) = quantifier
+        else:
+            return item
+        if character != "{":
+            self._position += 1
+
+        # Lazy quantifiers make no difference when matching whole words. We do not
+        # support possessive quantifiers, or anything else following a quantifier...
+        if self._peek() == "?":
+            self._position += 1
+        if self._peek() is not None and self._peek() in "*+?{":
+            raise _UnsupportedPattern()
+
+        return ("repeat", item, min_count, max_count)
+
+    def _parse_braces(self):
+        """
+        Parses a {m}, {m,} or {m,n} quantifier, returning (min, max). Returns None
+        if the brace is not a quantifier, in which case the position is not moved.
+        """
+        match = re.compile(r"\{(\d*)(,?)(\d*)\}").match(self._pattern, self._position)
+        if match is None or match.group(1) == "":
+            return None
+        min_count = int(match.group(1))
+        if match.group(2) == "":
+            max_count = min_count
+        elif match.group(3) == "":
+            max_count = None
+        else:
+            max_count = int(match.group(3))
+        if max(min_count, max_count or 0) > _Parser._MAX_REPEAT:
+            raise _UnsupportedPattern()
+        self._position = match.end()
+        return (min_count, max_count)
+
+    def _parse_atom(self):
+        """
+        Parses a single item: a character, a character class or a group.
+        """
+        character = self._next()
+        if character == "(":
+            # We support plain and non-capturing groups, but not other extensions...
+            if self._peek() == "?":
+                if self._pattern[self._position:self._position+2] != "?:":
+                    raise _UnsupportedPattern()
+                self._position += 2
+            item = self._parse_alternate()
+            if self._next() != ")":
+                raise _UnsupportedPattern()
+            return item
+        elif character == "[":
+            return ("set", self._parse_class())
+        elif character == ".":
+            return ("set", RegexAutomaton._ANY)
+        elif character == "\\":
+            return ("set", self._parse_escape())
+        elif character in "^$*+?{":
+            raise _UnsupportedPattern()
+        else:
+            return ("set", (frozenset(character), False))
+
+    def _parse_escape(self):
+        """
+        Parses the character after a backslash, returning its character set.
+        """
+        character = self._next()
+        if character in RegexAutomaton._ESCAPES:
+            return RegexAutomaton._ESCAPES[character]
+        if character.isalnum():
+            raise _UnsupportedPattern()  # Eg, back-references and \b
+        return (frozenset(character), False)
+
+    def _parse_class(self):
+        """
+        Parses a character class such as [a-z] or [^aeiou], after the opening bracket.
+        """
+        negated = False
+        if self._peek() == "^":
+            negated = True
+            self._position += 1
+
+        characters = set()
+        first = True
+        while True:
+            character = self._next()
+            if character == "]" and not first:
+                break
+            first = False
+            if character == "\\":
+                character = self._next()
+                if character.isalnum() or character == "[":
+                    raise _UnsupportedPattern()
+            elif character == "[":
+                raise _UnsupportedPattern()  # Eg, [[:alpha:]], which Python treats specially
+
+            # We check for a range such as a-z...
+            if self._peek() == "-" and self._pattern[self._position+1:self._position+2] not in ("", "]"):
+                self._position += 1
+                end = self._next()
+                if end == "\\":
+                    raise _UnsupportedPattern()
+                characters.update(chr(c) for c in range(ord(character), ord(end)+1))
+            else:
+                characters.add(character)
+
+        return (frozenset(characters), negated)
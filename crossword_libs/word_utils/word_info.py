@@ -10,4 +10,7 @@ class WordInfo(object):
 
         # The collection of part-of-speech tags for the word...
         self.pos_tags = set()
+
+        # The number of times the word appears in the tagged corpora...
+        self.frequency = 0
         
\ No newline at end of file
@@ -1,11 +1,17 @@
 import logging
+import sys
+import threading
+import time
 import nltk
 from nltk.corpus import wordnet
 from nltk.stem import WordNetLemmatizer 
 from collections import defaultdict
-from singleton_decorator import singleton
+from ..utils import singleton
 from ..utils import Utils
 from .lemma_info import LemmaInfo
+from .lexicon_trie import LexiconTrie
+from .load_profile import LoadProfile
+from .query_cache import QueryCache
 from .word_info import WordInfo
 from .word_utils import WordUtils
 
@@ -18,14 +24,36 @@ class WordManager(object):
     - The Brown tagged-words corpus
     - A file of English words
 
+    Which words are loaded is controlled by a LoadProfile, for example to use less
+    memory. All indexes of the words are built only over the words loaded.
+
     Helps find the part of speech (pos) for a word, and creates pos forms of words
     from the lemma (root form) and a pos indicator.
     """
 
-    def __init__(self):
+    # An estimate of the memory used for each word by the indexes built over
+    # the words (the anagram lookup, trie, length index and lemma map)...
+    _INDEX_BYTES_PER_WORD = 200
+
+    def __init__(self, profile=None):
         """
         Constructor.
+
+        The profile can be a LoadProfile or the name of one. If it is not
+        specified, all words are loaded.
         """
+        # The profile controlling which words we load...
+        profile = WordManager._get_profile(profile)
+        self.profile = profile
+
+        # Information about the last load: the profile, number of words, estimated
+        # memory and time taken...
+        self.load_report = dict()
+
+        # Incremented each time the collection of words changes, so that objects
+        # holding indexes of the words know to rebuild them...
+        self.lexicon_version = 0
+
         # Collection of WordInfo, keyed by the word itself...
         self.word_infos = defaultdict(WordInfo)
 
@@ -36,8 +64,24 @@ class WordManager(object):
         # Converts words to their lemmas...
         self._lemmatizer = WordNetLemmatizer()
 
+        # The length of the longest word...
+        self._max_word_length = 0
+
+        # A LexiconTrie of all words, created when first needed...
+        self._trie = None
+        self._trie_lock = threading.Lock()
+
+        # Collections of words, keyed by length, created when first needed...
+        self._words_by_length = dict()
+        self._words_by_length_lock = threading.Lock()
+
+        # Loads of the words are made one at a time. The new words are swapped in
+        # under the lexicon lock, so the words are never changed while in use...
+        self._load_lock = threading.Lock()
+        self._lexicon_lock = threading.Lock()
+
         # Loads all words, and finds their pos mappings...
-        self._load_all_words()
+        self._load_all_words(profile)
     
     def get_words(self, length=None):
         """
@@ -46,13 +90,50 @@ class WordManager(object):
         if length is None:
             return self.word_infos.keys()
         else:
-            return (word for word in self.word_infos if len(word) == length)
+            return self._get_words_with_length(length)
+
+    def load_profile(self, profile):
+        """
+        Reloads the words using the profile specified (a LoadProfile or the name of one).
+
+        The words are loaded into new collections, which replace the current ones when
+        they are complete. Code using the current words while we load is not affected.
+        """
+        with self._load_lock:
+            self._load_all_words(WordManager._get_profile(profile))
+
+    def is_word(self, word):
+        """
+        Returns True if the word is in the collection of words.
+        """
+        return word in self.word_infos
+
+    def get_max_word_length(self):
+        """
+        Returns the length of the longest word.
+        """
+        return self._max_word_length
+
+    def get_trie(self):
+        """
+        Returns a LexiconTrie of all words.
+        """
+        with self._trie_lock:
+            if self._trie is None:
+                logging.info("Creating lexicon trie.")
+                self._trie = LexiconTrie(self.word_infos.keys())
+            return self._trie
 
     def get_pos_tags(self, word):
         """
-        Returns the collection of pos-tags for the word.
+        Returns the collection of pos-tags for the word. This is empty if we do not
+        know the word.
         """
-        return self.word_infos[word].pos_tags
+        # We do not index word_infos directly, as this would add unknown words to it...
+        word_info = self.word_infos.get(word, None)
+        if word_info is None:
+            return set()
+        return word_info.pos_tags
 
     def get_part_of_speech(self, lemma, pos_tag):
         """
@@ -60,33 +141,167 @@ class WordManager(object):
         If we cannot find a word for the pos-tag, we return the lemma itself.
         """
 
-        # We check if we have info for this lemma...
-        if lemma not in self.lemma_infos:
+        # We check if we have info for this lemma. We use the current lemma_infos
+        # throughout, in case the words are reloaded while we are using them...
+        lemma_infos = self.lemma_infos
+        if lemma not in lemma_infos:
             return lemma  # We do not have info for the lemma, so we just return it
 
         # We have info for this lemma - so we check if we have a form for the 
         # pos-tag requested...
-        lemma_info  = self.lemma_infos[lemma]
+        lemma_info  = lemma_infos[lemma]
         if pos_tag not in lemma_info.word_forms:
             return lemma  # We do not have a word-form for the requested pos-tag, so we return the lemma
 
         # We have a word-form for the lemma and pos-tag requested...
-        return self.lemma_infos[lemma].word_forms[pos_tag]
+        return lemma_info.word_forms[pos_tag]
 
-    def _load_all_words(self):
+    def _load_all_words(self, profile):
         """
-        Loads a collection of all English words and creates maps:
+        Loads a collection of all English words using the profile, and creates maps:
         - word -> part-of-speech indicators 
         - lemma -> (part-of-speech-indicator -> word)
         """
-        self._load_words_from_corpus(nltk.corpus.brown)
-        self._load_words_from_corpus(nltk.corpus.treebank)
-        self._load_words_from_file()
-        self._map_lemmas_to_words()
+        logging.info("Loading words with profile: {0}".format(profile.name))
+        start_time = time.perf_counter()
+
+        word_infos = defaultdict(WordInfo)
+        lemma_infos = defaultdict(LemmaInfo)
+        self._load_words_from_corpus(nltk.corpus.brown, word_infos)
+        self._load_words_from_corpus(nltk.corpus.treebank, word_infos)
+        file_words = self._read_words_from_file(word_infos) if profile.include_words_file else []
+        file_words = self._apply_profile(profile, word_infos, file_words)
+        self._load_words_from_file(file_words, word_infos)
+        self._map_lemmas_to_words(word_infos, lemma_infos)
+
+        # We report on what we loaded...
+        load_report = dict(
+            profile=profile.name,
+            words=len(word_infos),
+            estimated_bytes=sum(self._estimate_word_bytes(word, word_info) for (word, word_info) in word_infos.items()),
+            memory_budget=profile.memory_budget,
+            load_seconds=time.perf_counter() - start_time)
+        logging.info("Loaded words: {0}".format(load_report))
 
-    def _load_words_from_corpus(self, corpus):
+        # We replace the previous words with the new ones...
+        with self._lexicon_lock:
+            self.profile = profile
+            self.word_infos = word_infos
+            self.lemma_infos = lemma_infos
+            self.load_report = load_report
+            self._on_lexicon_changed()
+
+    def _check_arguments(self, profile=None):
+        """
+        Called when the WordManager is requested after it has been created. The words
+        are not reloaded, so we warn if a different profile was requested.
         """
-        Loads words from a tagged corpus.
+        if profile is None:
+            return
+        profile = WordManager._get_profile(profile)
+        if profile is not self.profile:
+            logging.warning("WordManager was requested with profile '{0}', but has already loaded words with profile '{1}'. Use load_profile() to change the profile.".format(
+                profile.name, self.profile.name))
+
+    @staticmethod
+    def _get_profile(profile):
+        """
+        Returns the LoadProfile for the profile or profile-name passed in.
+        """
+        if profile is None:
+            return LoadProfile.named("full")
+        if isinstance(profile, str):
+            return LoadProfile.named(profile)
+        return profile
+
+    def _apply_profile(self, profile, word_infos, file_words):
+        """
+        Removes words loaded from the corpora into word_infos which the profile does not
+        keep, and returns the words from the file (which have not yet been loaded) which
+        it keeps.
+
+        If the profile has a memory budget and the words do not fit into it, we keep
+        whole groups of words while they fit. Words from the corpora are grouped by how
+        often they appear, most common first, followed by the words only in the file
+        grouped by length, shortest first. So the budget drops the rarest words or the
+        longest words, and never part of a group.
+        """
+        for word in [word for (word, word_info) in word_infos.items() if not profile.keeps(word, word_info.frequency)]:
+            del word_infos[word]
+        file_words = [word for word in file_words if profile.keeps(word, 0)]
+
+        if profile.memory_budget is None:
+            return file_words
+
+        # We find the cost of each word, as group -> [(word, cost)]. Words from the file
+        # do not yet have pos-tags, so we estimate them with an empty WordInfo...
+        groups = defaultdict(list)
+        for (word, word_info) in word_infos.items():
+            groups[(0, -word_info.frequency)].append((word, self._estimate_word_bytes(word, word_info)))
+        empty_word_info = WordInfo()
+        for word in file_words:
+            groups[(1, len(word))].append((word, self._estimate_word_bytes(word, empty_word_info)))
+
+        # We keep whole groups, most useful first, until the next group does not fit...
+        words_to_keep = set()
+        total_cost = 0
+        for group_key in sorted(groups):
+            group_cost = sum(cost for (_, cost) in groups[group_key])
+            if total_cost + group_cost > profile.memory_budget: break
+            total_cost += group_cost
+            words_to_keep.update(word for (word, _) in groups[group_key])
+
+        num_words = sum(len(group) for group in groups.values())
+        if len(words_to_keep) == num_words:
+            return file_words
+        logging.info("Keeping {0} of {1} words to fit memory budget.".format(len(words_to_keep), num_words))
+
+        for word in [word for word in word_infos if word not in words_to_keep]:
+            del word_infos[word]
+        return [word for word in file_words if word in words_to_keep]
+
+    @staticmethod
+    def _estimate_word_bytes(word, word_info):
+        """
+        Returns an estimate of the memory used by the word, its WordInfo and
+        its entries in the indexes of words.
+        """
+        return sys.getsizeof(word) + sys.getsizeof(word_info) + sys.getsizeof(word_info.__dict__) \
+            + sys.getsizeof(word_info.pos_tags) + WordManager._INDEX_BYTES_PER_WORD
+
+    def _on_lexicon_changed(self):
+        """
+        Called when the collection of words has changed. Invalidates anything
+        which was calculated from the previous collection.
+        """
+        self._max_word_length = max((len(word) for word in self.word_infos), default=0)
+        with self._trie_lock:
+            self._trie = None
+        with self._words_by_length_lock:
+            self._words_by_length = dict()
+        self.lexicon_version += 1
+        QueryCache().invalidate()
+
+    def _get_words_with_length(self, length):
+        """
+        Returns the collection of words with the length specified, as a dictionary of
+        word -> index of the word in the collection. The dictionary iterates the words in
+        the order they were loaded, and lets us quickly check whether a word is included.
+        """
+        with self._words_by_length_lock:
+            # We index the words of every length the first time any length is needed,
+            # as this takes one pass over the words rather than one per length...
+            if not self._words_by_length:
+                words_by_length = defaultdict(dict)
+                for word in self.word_infos:
+                    words_with_length = words_by_length[len(word)]
+                    words_with_length[word] = len(words_with_length)
+                self._words_by_length = dict(words_by_length)
+            return self._words_by_length.get(length, dict())
+
+    def _load_words_from_corpus(self, corpus, word_infos):
+        """
+        Loads words from a tagged corpus into word_infos.
         """
         logging.info("Loading words from corpus: {0}".format(str(corpus.root)))
         for (word, pos_tag) in corpus.tagged_words():
@@ -94,27 +309,42 @@ class WordManager(object):
             clean_word = WordUtils.clean_word(word)
             if clean_word == "": continue
             
-            # We add the word and its tag to the map of word -> pos-tags...
-            word_info = self.word_infos[clean_word]
+            # We add the word and its tag to the map of word -> pos-tags, and count
+            # how often the word appears...
+            word_info = word_infos[clean_word]
             word_info.pos_tags.add(pos_tag)
+            word_info.frequency += 1
 
-    def _load_words_from_file(self):
+    def _read_words_from_file(self, word_infos):
         """
-        Loads words from a file and attempts to infer pos info for them.
+        Returns a sorted list of the words from a file of words, which we do not
+        already have in word_infos from a different source.
         """
         # We read all lines from the file, removing whitespace...
         filename = "words_alpha.txt"
-        logging.info("Loading words from {0}".format(filename))
+        logging.info("Reading words from {0}".format(filename))
         path = Utils.path_relative_to_module(__file__, filename)
         with open(path, "r") as file:
             words = sorted([x.strip() for x in file.readlines()])
 
-        # We add these words to our collection, if we do not already have them...
-        active_first_letter = ""
+        # We clean the words, and skip words we already have...
+        results = []
+        seen_words = set()
         for word in words:
             clean_word = WordUtils.clean_word(word)
-            if clean_word in self.word_infos: continue  # We already have this word from a different source
+            if clean_word == "" or clean_word in seen_words or clean_word in word_infos: continue
+            seen_words.add(clean_word)
+            results.append(clean_word)
+        return results
 
+    def _load_words_from_file(self, words, word_infos):
+        """
+        Loads words read from a file into word_infos, and attempts to infer pos info for them.
+        """
+        # We add these words to our collection...
+        logging.info("Loading {0} words from file".format(len(words)))
+        active_first_letter = ""
+        for clean_word in words:
             # We log when as we process each letter...
             first_letter = clean_word[0]
             if first_letter != active_first_letter:
@@ -123,7 +353,7 @@ class WordManager(object):
 
             # We find the pos tags for the word, and store the WordInfo for this word...
             pos_tags = self._infer_pos_tags(clean_word)
-            self.word_infos[clean_word].pos_tags = set(pos_tags)
+            word_infos[clean_word].pos_tags = set(pos_tags)
 
     def _infer_pos_tags(self, word):
         """
@@ -139,18 +369,18 @@ class WordManager(object):
 
         return results
 
-    def _map_lemmas_to_words(self):
+    def _map_lemmas_to_words(self, word_infos, lemma_infos):
         """
-        Finds the lemma for each (word, pos-tag) we have found and maps the 
-        lemma to it.
+        Finds the lemma for each (word, pos-tag) in word_infos and maps the 
+        lemma to it in lemma_infos.
         """
         logging.info("Mapping lemmas to (word, pos-tag).")
-        for (word, word_info) in self.word_infos.items():
+        for (word, word_info) in word_infos.items():
             for pos_tag in word_info.pos_tags:
                 wordnet_pos = self._get_wordnet_pos(pos_tag)
                 if wordnet_pos is not None:
                     lemma = self._lemmatizer.lemmatize(word, pos=wordnet_pos)
-                    self.lemma_infos[lemma].word_forms[pos_tag] = word
+                    lemma_infos[lemma].word_forms[pos_tag] = word
 
     def _get_wordnet_pos(self, pos_tag):
         """
@@ -95,6 +95,22 @@ class WordUtils(object):
                     l.extend(remaining_combination)
                     yield l
 
+    @staticmethod
+    def edit_distance(word, pattern):
+        """
+        Returns the Levenshtein edit distance between the word and the pattern,
+        ie the number of letters which must be inserted, deleted or substituted
+        to change one into the other. A "." in the pattern matches any letter.
+        """
+        row = list(range(len(pattern) + 1))
+        for (word_index, letter) in enumerate(word):
+            next_row = [word_index + 1]
+            for (index, pattern_letter) in enumerate(pattern):
+                substitution_cost = 0 if pattern_letter in (letter, ".") else 1
+                next_row.append(min(row[index+1] + 1, next_row[index] + 1, row[index] + substitution_cost))
+            row = next_row
+        return row[-1]
+
     @staticmethod
     def is_alpha_or_space(letter):
         """
@@ -1,8 +1,12 @@
+import itertools
 import re
 from .anagram_helper import AnagramHelper
 from .definition_helper import DefinitionHelper
+from .query_cache import QueryCache
+from .regex_automaton import RegexAutomaton
 from .word_manager import WordManager
 from .word_utils import WordUtils
+from .words_stream import WordsStream
 
 
 class Words(object):
@@ -11,7 +15,22 @@ class Words(object):
 
     Examples:
     - Words().match("...)
+
+    The results of queries are cached by the QueryCache, keyed by a normalized
+    form of the chain of operations which produced them.
     """
+
+    # Operations which start a new collection of words, ignoring the words
+    # they are chained from...
+    _SOURCE_OPERATIONS = {"anagrams", "definition"}
+
+    # Operations which filter words without changing their order. A run of these
+    # gives the same results whichever order they are applied in...
+    _FILTER_OPERATIONS = {"contains", "length", "match"}
+
+    # When the lengths a pattern can match cover less than this fraction of all words,
+    # testing the words of those lengths with a regex is quicker than walking the trie...
+    _MAX_SCAN_FRACTION = 0.25
     
     def __init__(self):
         """
@@ -20,36 +39,53 @@ class Words(object):
         
         # We default the collection of words we hold to the collection of all
         # words known by the WordManager.
-        # Note: This object must be iterable.
-        self.words = WordManager().get_words()
+        #
+        # We hold a function which creates the words, rather than the words themselves,
+        # as the words are often a generator which can only be iterated once. Each
+        # iteration of this object starts the query again (or uses cached results).
+        self._create_words = WordManager().get_words
+
+        # The normalized query which produced the words, as a tuple of
+        # (operation, arguments). The empty query is all words...
+        self._query = ()
 
     def __iter__(self):
         """
         Allows the words held by these objects to be iterated.
         """
-        return self.words
+        if not self._query:
+            return iter(self._create_words())
+        return QueryCache().iterate(self._query, self._create_words)
+
+    @property
+    def words(self):
+        """
+        Returns a new iterable of the words held by this object, without using
+        the query cache.
+        """
+        return self._create_words()
 
     def print(self):
         """
         Prints the collection of words we hold.
         """
-        for word in self.words:
+        for word in self:
             print(word)
 
     def match(self, pattern):
         """
         Returns words which match the regex pattern supplied.
         """
-        result = Words()
-        result.words = self._internal_match(pattern)
+        result = self._chain("match", pattern)
+        result._create_words = lambda: self._internal_match(pattern)
         return result
 
     def contains(self, letters):
         """
         Returns words which contain the letters specified.
         """
-        result = Words()
-        result.words = self._internal_contains(letters)
+        result = self._chain("contains", "".join(sorted(letters)))
+        result._create_words = lambda: self._internal_contains(letters)
         return result
 
     def anagrams(self, word, word_lengths=None):
@@ -60,51 +96,211 @@ class Words(object):
         in the optional word_lengths parameter. For example:
           anagrams("astronomer", [4, 6]) -> ["moon", "starer"]
         """
-        result = Words()
+        if word_lengths is None:
+            word_lengths = [len(word)]
+        result = self._chain("anagrams", "".join(sorted(word)), tuple(word_lengths))
 
-        # We find anagrams...
-        anagrams = AnagramHelper().anagrams(word, word_lengths)
+        # We find anagrams. These are returned as a collection of tuples, which we
+        # convert to an iterable of single strings...
+        result._create_words = lambda: ("".join(anagram) for anagram in AnagramHelper().anagrams(word, word_lengths))
 
-        # The anagrams are returned as a collection of tuples. We convert these
-        # to an iterable of single strings...
-        result.words = ("".join(anagram) for anagram in anagrams)
+        return result
 
+    def near(self, word, max_distance=1):
+        """
+        Returns words within the edit distance specified of the word passed in,
+        ordered by their distance from it. A "." in the word matches any letter.
+        For example:
+          near("bottle", 1) -> "bottle", "battle", "bottled", ...
+          near("h.lo", 1) -> "halo", "hello", ...
+        """
+        word = word.lower()
+        result = self._chain("near", word, max_distance)
+        result._create_words = lambda: self._internal_near(word, max_distance)
         return result
 
     def definition(self, definition):
         """
         Returns words associated with the definition supplied.
         """
-        result = Words()
-        result.words = DefinitionHelper.words_for_definition(definition)
+        definition = definition.strip().lower()
+        result = self._chain("definition", definition)
+        result._create_words = lambda: DefinitionHelper.words_for_definition(definition)
         return result
 
     def length(self, length):
         """
         Returns words filtered to the length specified.
         """
+        result = self._chain("length", length)
+        result._create_words = lambda: self._internal_length(length)
+        return result
+
+    def stream(self, chunk_size=100, offset=0, limit=None):
+        """
+        Returns a WordsStream which iterates these words asynchronously, in chunks
+        calculated on a worker thread. For example:
+          async for chunk in Words().definition("rodent").stream(chunk_size=20):
+              ...
+
+        The stream skips the first offset words and returns at most limit words,
+        so that results can be paged through from a cursor.
+        """
+        return WordsStream(self, chunk_size, offset, limit)
+
+    @staticmethod
+    def cache_stats():
+        """
+        Returns the hit, miss and eviction statistics for the query cache.
+        """
+        return QueryCache().stats()
+
+    def _chain(self, operation, *args):
+        """
+        Returns a new Words object for the operation chained from this one,
+        with its normalized query set up.
+
+        Source operations replace the query they are chained from. Runs of filter
+        operations are sorted, so that for example length(5).match("a.*") and 
+        match("a.*").length(5) share a cache entry.
+        """
+        query = self._query + ((operation, args),)
+        if operation in Words._SOURCE_OPERATIONS:
+            query = query[-1:]
+        elif operation in Words._FILTER_OPERATIONS:
+            # We find the run of filters at the end of the query and sort it...
+            start = len(query) - 1
+            while start > 0 and query[start-1][0] in Words._FILTER_OPERATIONS:
+                start -= 1
+            query = query[:start] + tuple(sorted(query[start:], key=repr))
+
         result = Words()
-        result.words = (word for word in self.words if len(word) == length)
+        result._query = query
         return result
 
     def _internal_match(self, pattern):
         """
         Returns an iterable of words which match the pattern provided.
         """
+        # If we are matching against all words, we can walk the lexicon trie with an
+        # automaton for the pattern. This skips all words with a prefix which cannot
+        # match, rather than testing every word...
+        words = self
+        if not self._query:
+            automaton = RegexAutomaton.compile(pattern)
+            if automaton is not None:
+                word_manager = WordManager()
+
+                # If the pattern has a maximum length, we only need to test the words
+                # with the lengths it can match...
+                if automaton.max_length is not None:
+                    max_length = min(automaton.max_length, word_manager.get_max_word_length())
+                    lengths = range(max(automaton.min_length, 1), max_length+1)
+                    num_words = sum(len(word_manager.get_words(length)) for length in lengths)
+                    words = itertools.chain.from_iterable(word_manager.get_words(length) for length in lengths)
+                else:
+                    num_words = len(word_manager.word_infos)
+
+                # The trie cannot prune patterns which start with any letter, and is
+                # slower than a regex when the lengths alone leave few words to test...
+                trie_is_quicker = not automaton.has_open_start() and \
+                    num_words > len(word_manager.word_infos) * Words._MAX_SCAN_FRACTION
+                if trie_is_quicker:
+                    yield from word_manager.get_trie().match(automaton)
+                    return
+
         compiled_re = re.compile(pattern)
-        for word in self.words:
+        for word in words:
             if compiled_re.fullmatch(word) is not None:
                 yield word
 
+    def _internal_near(self, word, max_distance):
+        """
+        Returns an iterable of words within max_distance edits of the word provided,
+        ordered by distance.
+        """
+        # If we are searching all words, or all words filtered by length, pattern or
+        # letters, we use the lexicon trie, which only visits prefixes which are close
+        # enough to the word. The lengths the filters allow limit the trie's search,
+        # and we apply the filters to the words it finds...
+        if all(operation in Words._FILTER_OPERATIONS for (operation, _) in self._query):
+            (min_length, max_length) = (None, None)
+            filters = []
+            for (operation, args) in self._query:
+                (filter_min_length, filter_max_length, word_filter) = Words._get_filter(operation, args)
+                if filter_min_length is not None:
+                    min_length = filter_min_length if min_length is None else max(min_length, filter_min_length)
+                if filter_max_length is not None:
+                    max_length = filter_max_length if max_length is None else min(max_length, filter_max_length)
+                filters.append(word_filter)
+            if min_length is not None and max_length is not None and min_length > max_length:
+                return
+
+            trie = WordManager().get_trie()
+            for (near_word, _) in trie.near(word, max_distance, min_length, max_length):
+                if all(word_filter(near_word) for word_filter in filters):
+                    yield near_word
+            return
+
+        # We are filtering the results of another query, so we find the distance for
+        # each word. Words cannot be close enough if their lengths differ by too much...
+        near_words = []
+        for candidate in self:
+            if abs(len(candidate) - len(word)) > max_distance: continue
+            distance = WordUtils.edit_distance(candidate, word)
+            if distance <= max_distance:
+                near_words.append((distance, candidate))
+        near_words.sort(key=lambda near_word: near_word[0])
+        for (_, near_word) in near_words:
+            yield near_word
+
+    @staticmethod
+    def _get_filter(operation, args):
+        """
+        Returns (min-length, max-length, function) for a filter operation, where the
+        function returns True for words the filter keeps. The lengths are those of the
+        words the filter can keep, and are None if there is no limit.
+        """
+        if operation == "length":
+            (length,) = args
+            return (length, length, lambda word: len(word) == length)
+
+        if operation == "match":
+            (pattern,) = args
+            compiled_re = re.compile(pattern)
+            automaton = RegexAutomaton.compile(pattern)
+            (min_length, max_length) = (None, None) if automaton is None else (automaton.min_length, automaton.max_length)
+            return (min_length, max_length, lambda word: compiled_re.fullmatch(word) is not None)
+
+        # contains...
+        (letters,) = args
+        return (len(letters), None, lambda word: Words._contains_letters(word, letters))
+
+    @staticmethod
+    def _contains_letters(word, letters):
+        """
+        Returns True if the word contains the letters (including repeated letters).
+        """
+        return len(WordUtils.remove_letters_from_word(word, letters)) == len(word) - len(letters)
+
+    def _internal_length(self, length):
+        """
+        Returns an iterable of words with the length provided.
+        """
+        # If we are filtering all words, we can use the WordManager's index of words by length...
+        if not self._query:
+            yield from WordManager().get_words(length)
+            return
+
+        for word in self:
+            if len(word) == length:
+                yield word
+
     def _internal_contains(self, letters):
         """
         Returns an iterable of words which contain the letters provided.
         """
-        len_letters = len(letters)
-        for word in self.words:
-            len_word = len(word)
-            word_with_letters_removed = WordUtils.remove_letters_from_word(word, letters)
-            if len(word_with_letters_removed) == (len_word - len_letters):
+        for word in self:
+            if Words._contains_letters(word, letters):
                 yield word
 
-
@@ -0,0 +1,153 @@
+import asyncio
+import threading
+
+
+class WordsStream(object):
+    """
+    Iterates the results of a Words query asynchronously, in chunks which are
+    calculated on a worker thread. This means that a UI can show the first results
+    of a broad query without blocking until all the results are calculated.
+
+    Results are only calculated as they are requested. Streams can be paged through
+    using the cursor - ie, the position in the results of the next word to be returned.
+    A new stream can be started from a cursor by passing it as the offset.
+
+    Cancelling a stream (or the task awaiting it) is only checked between the words
+    returned by the query. Work the query does before returning its next word - for
+    example, a regex test of many words which do not match, or DefinitionHelper
+    looking up synsets and hyponyms - carries on in the worker thread until that
+    word is found or the query ends.
+
+    Examples:
+      async for chunk in Words().definition("rodent").stream(chunk_size=20):
+          ...
+
+      stream = Words().anagrams("astronomer", [4, 6]).stream()
+      first_page = await stream.page(10)
+      next_page = await stream.page(10)
+    """
+
+    def __init__(self, words, chunk_size=100, offset=0, limit=None):
+        """
+        Constructor.
+
+        words is the (synchronous) iterable of words to stream. The stream skips
+        the first offset words, and returns at most limit words.
+        """
+        self._iterator = iter(words)
+        self.chunk_size = chunk_size
+
+        # The position in the results of the next word we will return...
+        self.cursor = offset
+
+        # The number of words we have yet to skip, and the number we have yet to
+        # return (None if there is no limit)...
+        self._words_to_skip = offset
+        self._words_remaining = limit
+
+        # True when the underlying iterator has no more words...
+        self._exhausted = False
+
+        # Set when the stream is cancelled. The worker checks this between words...
+        self._cancelled = threading.Event()
+
+        # The underlying iterator is not thread-safe, so only one worker may use it at a time...
+        self._iterator_lock = threading.Lock()
+
+    def __aiter__(self):
+        """
+        Returns the async iterator for the stream, ie the stream itself.
+        """
+        return self
+
+    async def __anext__(self):
+        """
+        Returns the next chunk of words.
+        """
+        chunk = await self.page(self.chunk_size)
+        if not chunk:
+            raise StopAsyncIteration
+        return chunk
+
+    @property
+    def has_more(self):
+        """
+        True if the stream may have more words to return.
+        """
+        return not (self._exhausted or self._cancelled.is_set() or self._words_remaining == 0)
+
+    async def page(self, limit=None):
+        """
+        Returns a list of up to limit words (or chunk_size words, if limit is not
+        specified) from the current cursor. The cursor is moved on past the words returned.
+
+        If the task awaiting the page is cancelled, the stream is cancelled as well.
+        """
+        if limit is None:
+            limit = self.chunk_size
+        if self._words_remaining is not None:
+            limit = min(limit, self._words_remaining)
+        if limit <= 0 or not self.has_more:
+            return []
+
+        loop = asyncio.get_running_loop()
+        try:
+            return await loop.run_in_executor(None, self._take, limit)
+        except asyncio.CancelledError:
+            self.cancel()
+            raise
+
+    def cancel(self):
+        """
+        Cancels the stream. Any calculation in progress on the worker thread stops
+        when the query returns its next word, and the stream returns no more words.
+        """
+        self._cancelled.set()
+
+        # If the worker is not running, we close the iterator here. Otherwise
+        # the worker closes it when it sees the stream has been cancelled...
+        if self._iterator_lock.acquire(blocking=False):
+            try:
+                self._close()
+            finally:
+                self._iterator_lock.release()
+
+    def _take(self, limit):
+        """
+        Returns a list of up to limit words from the underlying iterator.
+        Runs on the worker thread.
+        """
+        words = []
+        with self._iterator_lock:
+            while len(words) < limit:
+                if self._cancelled.is_set():
+                    self._close()
+                    return []
+
+                try:
+                    word = next(self._iterator)
+                except StopIteration:
+                    self._exhausted = True
+                    break
+
+                # We skip words before the offset the stream was started from...
+                if self._words_to_skip > 0:
+                    self._words_to_skip -= 1
+                    continue
+
+                words.append(word)
+
+            self.cursor += len(words)
+            if self._words_remaining is not None:
+                self._words_remaining -= len(words)
+        return words
+
+    def _close(self):
+        """
+        Closes the underlying iterator, if it is a generator.
+        Must be called with the iterator lock held.
+        """
+        close = getattr(self._iterator, "close", None)
+        if close is not None:
+            close()
+        self._exhausted = True
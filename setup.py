@@ -1,13 +1,9 @@
-from crossword_libs import BitsAndPieces
 from crossword_libs import Utils
-from crossword_libs import Words
+from crossword_libs import WarmUp
 
 # Sets up logging...
 Utils.log_to_stdout()
 
-# Pre-loads words...
-Words()
-
-# Pre-loads bits-and-pieces...
-BitsAndPieces()
+# Pre-loads words, anagrams and bits-and-pieces (in parallel)...
+WarmUp().warm_up().wait()
 